@@ -4,7 +4,54 @@ Hand tracking module using MediaPipe.
 
 import cv2
 import mediapipe as mp
-from config import DEPTH_THRESHOLD_NEAR, DEPTH_THRESHOLD_FAR
+import numpy as np
+
+NUM_LANDMARKS = 21
+CENTER_LANDMARK = mp.solutions.hands.HandLandmark.MIDDLE_FINGER_MCP
+HAND_CONNECTIONS = np.array(sorted(mp.solutions.hands.HAND_CONNECTIONS),
+                            dtype=np.intp)
+
+
+class HandState:
+    """Per-frame hand detections in pixel coordinates."""
+
+    __slots__ = ('landmarks', 'handedness', 'scores', 'centers', 'depths')
+
+    def __init__(self, landmarks, handedness, scores, centers):
+        """
+        Initialize the hand state.
+
+        Args:
+            landmarks: float32 array (hands x 21 x 3) in pixels
+            handedness: Tuple of 'Left'/'Right' labels
+            scores: float32 array of handedness scores
+            centers: int32 array (hands x 2) of hand centers
+        """
+        self.landmarks = landmarks
+        self.handedness = handedness
+        self.scores = scores
+        self.centers = centers
+        self.depths = np.empty(0, dtype=np.float32)
+
+    @classmethod
+    def empty(cls):
+        """Create a state with no hands."""
+        return cls(np.empty((0, NUM_LANDMARKS, 3), dtype=np.float32), (),
+                   np.empty(0, dtype=np.float32),
+                   np.empty((0, 2), dtype=np.int32))
+
+    def __len__(self):
+        return len(self.landmarks)
+
+    def sample_depths(self, depth_map):
+        """
+        Sample normalized depth (0-1) at each hand center.
+
+        Args:
+            depth_map: uint8 depth map of the frame
+        """
+        self.depths = depth_map[self.centers[:, 1],
+                                self.centers[:, 0]] / np.float32(255.0)
 
 
 class HandTracker:
@@ -15,7 +62,6 @@ class HandTracker:
             min_detection_confidence=min_detection_confidence,
             min_tracking_confidence=min_tracking_confidence
         )
-        self.mp_drawing = mp.solutions.drawing_utils
 
     def detect_hands(self, frame):
         """
@@ -25,62 +71,49 @@ class HandTracker:
             frame: BGR image (OpenCV format)
 
         Returns:
-            results: MediaPipe hand detection results
+            HandState: Detected hands in pixel coordinates
         """
         frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        return self.hands.process(frame_rgb)
+        results = self.hands.process(frame_rgb)
+        return self._to_hand_state(results, frame.shape)
 
-    def draw_landmarks(self, frame, results):
-        """
-        Draw hand landmarks on the frame.
+    def _to_hand_state(self, results, frame_shape):
+        """Convert MediaPipe results into a HandState."""
+        if not results.multi_hand_landmarks:
+            return HandState.empty()
 
-        Args:
-            frame: BGR image
-            results: MediaPipe detection results
-        """
-        if results.multi_hand_landmarks:
-            for hand_landmarks in results.multi_hand_landmarks:
-                self.mp_drawing.draw_landmarks(
-                    frame,
-                    hand_landmarks,
-                    self.mp_hands.HAND_CONNECTIONS
-                )
-
-    def get_hand_center(self, landmarks, frame_shape):
-        """
-        Get the center point of the hand.
+        h, w = frame_shape[:2]
+        landmarks = np.array(
+            [[(lm.x, lm.y, lm.z) for lm in hand.landmark]
+             for hand in results.multi_hand_landmarks],
+            dtype=np.float32
+        )
+        landmarks *= np.array((w, h, w), dtype=np.float32)
 
-        Args:
-            landmarks: Hand landmarks
-            frame_shape: Shape of the frame
+        classifications = [c.classification[0]
+                           for c in results.multi_handedness]
+        handedness = tuple(c.label for c in classifications)
+        scores = np.array([c.score for c in classifications], dtype=np.float32)
 
-        Returns:
-            tuple: (x, y) coordinates of hand center
-        """
-        h, w = frame_shape[:2]
-        lm = landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_MCP]
-        return int(lm.x * w), int(lm.y * h)
+        centers = np.clip(landmarks[:, CENTER_LANDMARK, :2], 0,
+                          np.array((w - 1, h - 1)))
+
+        return HandState(landmarks, handedness, scores,
+                         centers.astype(np.int32))
 
-    def check_hand_in_box(self, landmarks, box_coords, depth_value, frame_shape):
+    def draw_landmarks(self, frame, hand_state):
         """
-        Check if hand is inside a box and at correct depth.
+        Draw hand landmarks on the frame.
 
         Args:
-            landmarks: Hand landmarks
-            box_coords: (x1, y1, x2, y2) box coordinates
-            depth_value: Normalized depth value
-            frame_shape: Shape of the frame
-
-        Returns:
-            bool: True if hand is in box at correct depth
+            frame: BGR image
+            hand_state: HandState for this frame
         """
-        x, y = self.get_hand_center(landmarks, frame_shape)
-        x1, y1, x2, y2 = box_coords
-
-        in_box = (x1 < x < x2) and (y1 < y < y2)
-        correct_depth = DEPTH_THRESHOLD_NEAR < depth_value < DEPTH_THRESHOLD_FAR
-
-        return in_box and correct_depth
+        for points in hand_state.landmarks[:, :, :2].astype(np.int32):
+            cv2.polylines(frame, list(points[HAND_CONNECTIONS]), False,
+                          (224, 224, 224), 2)
+            for x, y in points:
+                cv2.circle(frame, (int(x), int(y)), 3, (0, 0, 255), -1)
 
     def release(self):
         """Release resources."""
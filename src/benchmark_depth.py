@@ -0,0 +1,166 @@
+"""
+Benchmark CPU inference settings of the depth estimator against the
+default eager path.
+
+Each configuration runs in its own process, because torch's inter-op
+thread count can only be set once per process. The "eager" row is today's
+path: default torch intra- and inter-op threads, contiguous tensors, no graph.
+
+Usage:
+    python benchmark_depth.py --iterations 50 --configs eager threads channels_last
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+import torch
+
+from config import CAMERA_WIDTH, CAMERA_HEIGHT
+from depth_estimator import DepthEstimator, configure_cpu_threads
+
+# Name -> settings. 'tuned_threads' False keeps torch's and OpenCV's
+# default thread counts, True applies --threads / --interop-threads to torch
+# and the same intra-op count to OpenCV. 'batch' runs
+# estimate_depth_batch with --batch-size frames per call.
+CONFIGS = {
+    'eager': {'tuned_threads': False, 'channels_last': False,
+              'graph_mode': None, 'batch': False},
+    'threads': {'tuned_threads': True, 'channels_last': False,
+                'graph_mode': None, 'batch': False},
+    'channels_last': {'tuned_threads': True, 'channels_last': True,
+                      'graph_mode': None, 'batch': False},
+    'torchscript': {'tuned_threads': True, 'channels_last': True,
+                    'graph_mode': 'torchscript', 'batch': False},
+    'compile': {'tuned_threads': True, 'channels_last': True,
+                'graph_mode': 'compile', 'batch': False},
+    'batch': {'tuned_threads': True, 'channels_last': True,
+              'graph_mode': None, 'batch': True},
+}
+
+
+def time_calls(fn, inputs, iterations):
+    """
+    Time repeated calls of ``fn``.
+
+    Returns:
+        numpy array: Per-call latencies in milliseconds
+    """
+    latencies = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        fn(inputs[i % len(inputs)])
+        latencies.append((time.perf_counter() - start) * 1000.0)
+    return np.array(latencies)
+
+
+def run_config(name, args):
+    """Benchmark one configuration in this process and print its row."""
+    settings = CONFIGS[name]
+    if settings['tuned_threads']:
+        configure_cpu_threads(args.threads, args.interop_threads)
+
+    # Thread counts are set above (or left at torch's defaults), so the
+    # estimator must not touch them
+    estimator = DepthEstimator(device="cpu",
+                               channels_last=settings['channels_last'],
+                               graph_mode=settings['graph_mode'],
+                               num_threads=torch.get_num_threads(),
+                               interop_threads=None,
+                               warmup_shape=None)
+    if not settings['tuned_threads']:
+        # The estimator budgets OpenCV too; restore its default pool size
+        cv2.setNumThreads(-1)
+
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 256, (args.height, args.width, 3), dtype=np.uint8)
+              for _ in range(max(8, args.batch_size))]
+
+    if settings['batch']:
+        batches = [frames[i:i + args.batch_size]
+                   for i in range(0, len(frames) - args.batch_size + 1,
+                                  args.batch_size)]
+        for _ in range(args.warmup):
+            estimator.estimate_depth_batch(batches[0])
+        output = estimator.estimate_depth_batch(batches[0])[0]
+        latencies = time_calls(estimator.estimate_depth_batch, batches,
+                               max(1, args.iterations // args.batch_size))
+        frames_per_call = args.batch_size
+    else:
+        estimator.warmup((args.height, args.width), args.warmup)
+        output = estimator.estimate_depth(frames[0])
+        latencies = time_calls(estimator.estimate_depth, frames,
+                               args.iterations)
+        frames_per_call = 1
+
+    # The first configuration saves its output, later ones report the
+    # largest difference from it
+    output = output.astype(np.int16)
+    if os.path.exists(args.reference):
+        max_diff = int(np.abs(output - np.load(args.reference)).max())
+    else:
+        np.save(args.reference, output)
+        max_diff = 0
+
+    # A failed graph build falls back to eager, flag it in the row
+    label = name if estimator.graph_mode == settings['graph_mode'] \
+        else f"{name}(eager)"
+    # Report per-frame latency so batched rows compare with the others
+    latencies = latencies / frames_per_call
+    p50, p90 = np.percentile(latencies, (50, 90))
+    fps = 1000.0 / latencies.mean()
+    print(f"{label:<16} {torch.get_num_threads():>7} "
+          f"{torch.get_num_interop_threads():>7} {latencies.mean():>9.1f} "
+          f"{p50:>9.1f} {p90:>9.1f} {fps:>8.1f} {max_diff:>8}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--width', type=int, default=CAMERA_WIDTH)
+    parser.add_argument('--height', type=int, default=CAMERA_HEIGHT)
+    parser.add_argument('--threads', type=int, default=None,
+                        help="Intra-op threads for tuned configs "
+                             "(default: all cores minus HAND_TRACKER_CORES)")
+    parser.add_argument('--interop-threads', type=int, default=1,
+                        help="Inter-op threads for tuned configs")
+    parser.add_argument('--batch-size', type=int, default=4,
+                        help="Frames per call for the 'batch' config")
+    parser.add_argument('--configs', nargs='+', default=list(CONFIGS),
+                        choices=list(CONFIGS))
+    # Internal: run a single config in this process
+    parser.add_argument('--run', choices=list(CONFIGS), help=argparse.SUPPRESS)
+    parser.add_argument('--reference', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run_config(args.run, args)
+        return
+
+    print(f"Frames {args.width}x{args.height}, {args.iterations} iterations, "
+          f"torch default threads {torch.get_num_threads()}/"
+          f"{torch.get_num_interop_threads()} (intra/inter-op)")
+    print("Latencies are milliseconds per frame; batched rows divide each "
+          "call by the batch size")
+    print(f"{'config':<16} {'intra':>7} {'inter':>7} {'mean ms':>9} "
+          f"{'p50 ms':>9} {'p90 ms':>9} {'fps':>8} {'max diff':>8}",
+          flush=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        reference = os.path.join(tmp, 'reference.npy')
+        child_args = sys.argv[1:]
+        for name in args.configs:
+            result = subprocess.run([sys.executable, __file__, *child_args,
+                                     '--run', name, '--reference', reference])
+            if result.returncode != 0:
+                print(f"{name:<16} failed with exit code {result.returncode}")
+
+
+if __name__ == "__main__":
+    main()
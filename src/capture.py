@@ -0,0 +1,327 @@
+"""
+Frame capture sources for the HandTrack3D system.
+"""
+
+import threading
+import time
+
+import cv2
+import numpy as np
+from config import (
+    CAPTURE_BACKEND,
+    CAPTURE_FILE_PATH,
+    CAPTURE_LOOP_FILE,
+    CAMERA_INDEX,
+    CAMERA_WIDTH,
+    CAMERA_HEIGHT,
+    CAMERA_FPS,
+    CAMERA_FOURCC,
+    CAMERA_BUFFER_SIZE,
+    MIRROR_FRAMES
+)
+
+
+class FrameSource:
+    # One buffer owned by the consumer, one holding the latest frame and
+    # one being written by the grab thread.
+    NUM_BUFFERS = 3
+
+    def __init__(self, mirror=MIRROR_FRAMES):
+        """
+        Initialize the frame source.
+
+        Args:
+            mirror: Flip frames horizontally while grabbing
+        """
+        self.mirror = mirror
+        self._buffers = [None] * self.NUM_BUFFERS
+        self._timestamps = [0.0] * self.NUM_BUFFERS
+        self._scratch = None
+        self._latest = None
+        self._in_use = None
+        self._seq = 0
+        self._read_seq = 0
+        self.last_seq = 0
+        self.last_timestamp = 0.0
+        self._running = False
+        self._thread = None
+        self._cond = threading.Condition()
+
+    def _open(self):
+        """Open the underlying device. Returns True on success."""
+        return True
+
+    def _close(self):
+        """Close the underlying device."""
+
+    def _grab(self, out):
+        """
+        Grab the next frame, reusing ``out`` when possible.
+
+        Args:
+            out: Previously used buffer or None
+
+        Returns:
+            tuple: (ok, frame)
+        """
+        raise NotImplementedError
+
+    def start(self):
+        """Open the source and start the grab thread."""
+        if self._running:
+            return True
+        if not self._open():
+            return False
+        self._running = True
+        self._thread = threading.Thread(target=self._grab_loop, daemon=True)
+        self._thread.start()
+        return True
+
+    def isOpened(self):
+        """Check whether the source is delivering frames."""
+        return self._running
+
+    def _grab_loop(self):
+        """
+        Keep grabbing frames so that read() always sees the newest one.
+
+        The thread owns the device while it runs, so it closes the device
+        itself on the way out.
+        """
+        try:
+            while self._running:
+                with self._cond:
+                    index = next(i for i in range(self.NUM_BUFFERS)
+                                 if i != self._latest and i != self._in_use)
+
+                if self.mirror:
+                    ok, self._scratch = self._grab(self._scratch)
+                    frame = cv2.flip(self._scratch, 1, self._buffers[index]) if ok else None
+                else:
+                    ok, frame = self._grab(self._buffers[index])
+                timestamp = time.monotonic()
+
+                with self._cond:
+                    if not ok:
+                        break
+                    self._buffers[index] = frame
+                    self._timestamps[index] = timestamp
+                    self._latest = index
+                    self._seq += 1
+                    self._cond.notify_all()
+        except Exception as e:
+            print(f"Frame grab failed: {e}")
+        finally:
+            with self._cond:
+                self._running = False
+                self._cond.notify_all()
+            self._close()
+
+    def read(self, timeout=1.0):
+        """
+        Return the freshest frame not yet seen by the caller.
+
+        The returned array stays valid until the next call to read().
+        A (False, None) result while isOpened() is still True means the
+        timeout expired before a new frame arrived.
+        ``last_seq`` and ``last_timestamp`` describe the returned frame; a
+        gap in ``last_seq`` means frames were overwritten before being read.
+
+        Args:
+            timeout: Seconds to wait for a new frame
+
+        Returns:
+            tuple: (ret, frame)
+        """
+        with self._cond:
+            if not self._cond.wait_for(
+                    lambda: self._seq != self._read_seq or not self._running,
+                    timeout):
+                return False, None
+            if self._seq == self._read_seq:
+                return False, None
+            self._in_use = self._latest
+            self._latest = None
+            self._read_seq = self._seq
+            self.last_seq = self._seq
+            self.last_timestamp = self._timestamps[self._in_use]
+            return True, self._buffers[self._in_use]
+
+    def release(self):
+        """Stop the grab thread and release the source."""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            # A grab blocked in the driver finishes in the background and
+            # the thread closes the device when it exits
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        else:
+            self._close()
+
+
+class CameraSource(FrameSource):
+    def __init__(self, index=CAMERA_INDEX, width=CAMERA_WIDTH,
+                 height=CAMERA_HEIGHT, fps=CAMERA_FPS, fourcc=CAMERA_FOURCC,
+                 buffer_size=CAMERA_BUFFER_SIZE, mirror=MIRROR_FRAMES):
+        """Initialize a camera source with low-latency capture settings."""
+        super().__init__(mirror)
+        self.index = index
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.fourcc = fourcc
+        self.buffer_size = buffer_size
+        self.capture = None
+
+    def _open(self):
+        """Open the camera and apply capture settings."""
+        self.capture = cv2.VideoCapture(self.index)
+        if not self.capture.isOpened():
+            return False
+
+        # FOURCC must be set before the resolution on most V4L2 drivers
+        if self.fourcc:
+            self.capture.set(cv2.CAP_PROP_FOURCC,
+                             cv2.VideoWriter_fourcc(*self.fourcc))
+        if self.width and self.height:
+            self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+            self.capture.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        if self.fps:
+            self.capture.set(cv2.CAP_PROP_FPS, self.fps)
+        if self.buffer_size:
+            self.capture.set(cv2.CAP_PROP_BUFFERSIZE, self.buffer_size)
+        return True
+
+    def _grab(self, out):
+        """Read a frame from the camera."""
+        return self.capture.read(out)
+
+    def _close(self):
+        """Release the camera."""
+        if self.capture is not None:
+            self.capture.release()
+            self.capture = None
+
+
+class FileSource(FrameSource):
+    def __init__(self, path=CAPTURE_FILE_PATH, loop=CAPTURE_LOOP_FILE,
+                 realtime=True, mirror=False):
+        """
+        Initialize a video file source.
+
+        Args:
+            path: Video file path
+            loop: Restart from the beginning at end of file
+            realtime: Pace frames at the file's native FPS
+            mirror: Flip frames horizontally
+        """
+        super().__init__(mirror)
+        self.path = path
+        self.loop = loop
+        self.realtime = realtime
+        self.capture = None
+        self._interval = 0
+        self._next_time = 0
+
+    def _open(self):
+        """Open the video file."""
+        if not self.path:
+            raise ValueError("CAPTURE_FILE_PATH must be set to use the "
+                             "\"file\" capture backend")
+        self.capture = cv2.VideoCapture(self.path)
+        if not self.capture.isOpened():
+            return False
+        fps = self.capture.get(cv2.CAP_PROP_FPS)
+        self._interval = 1.0 / fps if self.realtime and fps > 0 else 0
+        self._next_time = time.monotonic()
+        return True
+
+    def _grab(self, out):
+        """Read the next frame, looping or pacing as configured."""
+        if self._interval:
+            delay = self._next_time - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self._next_time = max(self._next_time + self._interval,
+                                  time.monotonic())
+
+        ok, frame = self.capture.read(out)
+        if not ok and self.loop:
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self.capture.read(out)
+        return ok, frame
+
+    def _close(self):
+        """Release the video file."""
+        if self.capture is not None:
+            self.capture.release()
+            self.capture = None
+
+
+class SyntheticSource(FrameSource):
+    def __init__(self, width=CAMERA_WIDTH, height=CAMERA_HEIGHT,
+                 fps=CAMERA_FPS, mirror=False):
+        """
+        Initialize a synthetic source producing a moving test pattern.
+
+        Args:
+            width, height: Frame size
+            fps: Frame rate (0 for as fast as possible)
+            mirror: Flip frames horizontally
+        """
+        super().__init__(mirror)
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.frame_index = 0
+        self._next_time = 0
+
+    def _open(self):
+        """Reset the pattern clock."""
+        self.frame_index = 0
+        self._next_time = time.monotonic()
+        return True
+
+    def _grab(self, out):
+        """Render the next test pattern frame into ``out``."""
+        if self.fps:
+            delay = self._next_time - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self._next_time = max(self._next_time + 1.0 / self.fps,
+                                  time.monotonic())
+
+        if out is None or out.shape != (self.height, self.width, 3):
+            out = np.empty((self.height, self.width, 3), dtype=np.uint8)
+
+        out[:] = (40, 40, 40)
+        t = self.frame_index / (self.fps or 30)
+        x = int((0.5 + 0.4 * np.sin(t)) * self.width)
+        y = int((0.5 + 0.3 * np.cos(0.7 * t)) * self.height)
+        cv2.circle(out, (x, y), min(self.width, self.height) // 10,
+                   (180, 200, 230), -1)
+        cv2.putText(out, f"{self.frame_index}", (10, self.height - 10),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+        self.frame_index += 1
+        return True, out
+
+
+def create_frame_source(backend=CAPTURE_BACKEND):
+    """
+    Create a frame source for the configured backend.
+
+    Args:
+        backend: "camera", "file" or "synthetic"
+
+    Returns:
+        FrameSource: Unstarted frame source
+    """
+    if backend == "camera":
+        return CameraSource()
+    if backend == "file":
+        return FileSource()
+    if backend == "synthetic":
+        return SyntheticSource()
+    raise ValueError(f"Unknown capture backend: {backend}")
@@ -35,6 +35,18 @@ FONT_SIZES = {
 ENCODER = "vits"
 MODEL_NAME = f"LiheYoung/depth_anything_{ENCODER}14"
 
+# CPU Inference Settings (ignored on CUDA)
+DEPTH_NUM_THREADS = None       # None: all cores minus HAND_TRACKER_CORES
+DEPTH_INTEROP_THREADS = 1
+OPENCV_NUM_THREADS = None      # None: same as the depth intra-op threads
+# Cores kept free of torch and OpenCV work for MediaPipe. The MediaPipe
+# Hands Python API has no thread count setting, so this is a reservation
+# by exclusion rather than a limit on MediaPipe itself.
+HAND_TRACKER_CORES = 2
+DEPTH_CHANNELS_LAST = False
+DEPTH_GRAPH_MODE = None        # None, "torchscript" or "compile"
+DEPTH_WARMUP_ITERATIONS = 3
+
 # Box to Step Mapping
 BOX_TO_STEP_MAPPING = {
     "Box_1": 1,
@@ -55,3 +67,23 @@ IMAGE_PATHS = {
 
 # Camera Settings
 CAMERA_INDEX = 0
+
+# Capture Settings
+CAPTURE_BACKEND = "camera"   # "camera", "file" or "synthetic"
+CAPTURE_FILE_PATH = None     # Video file used by the "file" backend
+CAPTURE_LOOP_FILE = True
+CAMERA_WIDTH = 1280
+CAMERA_HEIGHT = 720
+CAMERA_FPS = 30
+CAMERA_FOURCC = "MJPG"
+CAMERA_BUFFER_SIZE = 1
+MIRROR_FRAMES = True
+
+# Telemetry Settings
+STATS_WINDOW_SIZE = 1000      # Samples kept per latency distribution
+STATS_DUMP_PATH = "handtrack3d_stats.json"
+STATS_DUMP_INTERVAL = 5.0     # Seconds between stats dumps
+
+# Interaction Engine Settings
+INTERACTION_QUEUE_SIZE = 2      # Pending observations before dropping oldest
+INTERACTION_DWELL_TIME = 0.0    # Seconds at correct depth before a touch
@@ -2,7 +2,10 @@
 Depth estimation module using DepthAnything model.
 """
 
+import os
+
 import cv2
+import numpy as np
 import torch
 import torch.nn.functional as F
 from torchvision.transforms import Compose
@@ -12,22 +15,130 @@ from depth_anything.util.transform import (
     NormalizeImage,
     PrepareForNet
 )
-from config import MODEL_NAME
+from config import (
+    MODEL_NAME,
+    CAMERA_WIDTH,
+    CAMERA_HEIGHT,
+    DEPTH_NUM_THREADS,
+    DEPTH_INTEROP_THREADS,
+    OPENCV_NUM_THREADS,
+    HAND_TRACKER_CORES,
+    DEPTH_CHANNELS_LAST,
+    DEPTH_GRAPH_MODE,
+    DEPTH_WARMUP_ITERATIONS
+)
+
+
+def configure_cpu_threads(num_threads=DEPTH_NUM_THREADS,
+                          interop_threads=DEPTH_INTEROP_THREADS,
+                          opencv_threads=OPENCV_NUM_THREADS):
+    """
+    Set torch and OpenCV thread budgets so they leave HAND_TRACKER_CORES
+    cores for MediaPipe, whose own thread count cannot be configured.
+
+    OpenCV's preprocessing (color conversion, resize, flip) runs right
+    before torch inference on the same pipeline, so by default it shares
+    the depth budget instead of using every core.
+
+    Args:
+        num_threads: Intra-op threads, None for all cores minus
+            HAND_TRACKER_CORES
+        interop_threads: Inter-op threads, None to keep the default
+        opencv_threads: OpenCV threads, None for the intra-op count
+
+    Returns:
+        int: Intra-op thread count in use
+    """
+    if num_threads is None:
+        num_threads = max(1, (os.cpu_count() or 1) - HAND_TRACKER_CORES)
+    torch.set_num_threads(num_threads)
+
+    if interop_threads is not None and \
+            torch.get_num_interop_threads() != interop_threads:
+        try:
+            torch.set_num_interop_threads(interop_threads)
+        except RuntimeError:
+            # Can only be set once, before any inter-op work has started
+            print("Inter-op threads already initialized, keeping "
+                  f"{torch.get_num_interop_threads()}")
+
+    cv2.setNumThreads(num_threads if opencv_threads is None
+                      else opencv_threads)
+    return torch.get_num_threads()
 
 
 class DepthEstimator:
-    def __init__(self, device="cuda" if torch.cuda.is_available() else "cpu"):
-        """Initialize the depth estimator with the DepthAnything model."""
+    def __init__(self, device="cuda" if torch.cuda.is_available() else "cpu",
+                 channels_last=DEPTH_CHANNELS_LAST,
+                 graph_mode=DEPTH_GRAPH_MODE,
+                 num_threads=DEPTH_NUM_THREADS,
+                 interop_threads=DEPTH_INTEROP_THREADS,
+                 warmup_shape=(CAMERA_HEIGHT, CAMERA_WIDTH)):
+        """
+        Initialize the depth estimator with the DepthAnything model.
+
+        Args:
+            device: Torch device
+            channels_last: Use channels_last memory format on CPU
+            graph_mode: None, "torchscript" or "compile" on CPU
+            num_threads: Intra-op threads on CPU (see configure_cpu_threads)
+            interop_threads: Inter-op threads on CPU
+            warmup_shape: (height, width) of frames to warm up for, or None
+        """
         self.device = device
-        self.model = self._initialize_model()
+        self.cpu = torch.device(device).type == "cpu"
+        self.channels_last = channels_last and self.cpu
+        if graph_mode not in (None, "torchscript", "compile"):
+            raise ValueError(f"Unknown graph mode: {graph_mode}")
+        self.graph_mode = graph_mode if self.cpu else None
+        self.graph = None
+        self.graph_shape = None
+
+        if self.cpu:
+            configure_cpu_threads(num_threads, interop_threads)
+
         self.transform = self._create_transform()
+        self.model = self._initialize_model()
+
+        if warmup_shape is not None:
+            self.warmup(warmup_shape)
 
     def _initialize_model(self):
         """Initialize and prepare the DepthAnything model."""
         model = DepthAnything.from_pretrained(MODEL_NAME).to(self.device)
         model.eval()
+        if self.channels_last:
+            model = model.to(memory_format=torch.channels_last)
         return model
 
+    def _build_graph(self, example):
+        """
+        Build a graph specialized to the shape of ``example`` and run it once.
+
+        torch.compile only compiles on the first call, so that call is part
+        of the build. If building fails the eager model is used from then on.
+
+        Returns:
+            torch tensor: Model output for ``example``
+        """
+        try:
+            if self.graph_mode == "torchscript":
+                graph = torch.jit.optimize_for_inference(
+                    torch.jit.freeze(torch.jit.trace(self.model, example)))
+            else:
+                graph = torch.compile(self.model, dynamic=False)
+            output = graph(example)
+        except Exception as e:
+            print(f"Failed to build {self.graph_mode} graph, using eager: {e}")
+            self.graph_mode = None
+            self.graph = None
+            self.graph_shape = None
+            return self.model(example)
+
+        self.graph = graph
+        self.graph_shape = tuple(example.shape)
+        return output
+
     def _create_transform(self):
         """Create the image transformation pipeline."""
         return Compose([
@@ -45,49 +156,90 @@ class DepthEstimator:
             PrepareForNet(),
         ])
 
-    @torch.no_grad()
-    def estimate_depth(self, frame):
+    def _prepare(self, frame):
+        """Convert a BGR frame into a normalized CHW tensor."""
+        image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) / 255.0
+        return torch.from_numpy(self.transform({"image": image})["image"])
+
+    def _infer(self, batch, use_graph=True):
         """
-        Estimate depth from input frame.
+        Run the model on a batch.
+
+        The graph is rebuilt whenever the input shape changes, since traced
+        graphs bake in the positional embedding size of one shape.
 
         Args:
-            frame: BGR image (OpenCV format)
+            batch: float tensor (N x 3 x H x W)
+            use_graph: Use the specialized graph if a graph mode is set
 
         Returns:
-            numpy array: Depth map normalized to 0-255 range
+            torch tensor: Raw depth (N x h x w) at the model's output size
         """
-        # Convert BGR to RGB and normalize
-        image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) / 255.0
-        h, w = image.shape[:2]
+        batch = batch.to(self.device)
+        if self.channels_last:
+            batch = batch.contiguous(memory_format=torch.channels_last)
+        if not use_graph or self.graph_mode is None:
+            return self.model(batch)
+        if tuple(batch.shape) != self.graph_shape:
+            return self._build_graph(batch)
+        return self.graph(batch)
+
+    def _postprocess(self, depth, h, w):
+        """Resize depth (N x h' x w') to (h, w) and normalize to uint8."""
+        depth = F.interpolate(depth[:, None], (h, w),
+                              mode="bilinear",
+                              align_corners=False)[:, 0]
 
-        # Transform image
-        transformed = self.transform({"image": image})["image"]
-        transformed = torch.from_numpy(
-            transformed).unsqueeze(0).to(self.device)
+        # Normalize each depth map
+        d_min = depth.amin(dim=(1, 2), keepdim=True)
+        d_max = depth.amax(dim=(1, 2), keepdim=True)
+        depth = (depth - d_min) / (d_max - d_min) * 255.0
+        return depth.cpu().numpy().astype('uint8')
 
-        # Get depth prediction
-        depth = self.model(transformed)
+    @torch.no_grad()
+    def warmup(self, shape, iterations=DEPTH_WARMUP_ITERATIONS):
+        """
+        Run dummy frames through the model so graphs are built and kernels
+        are selected before the first real frame.
 
-        # Resize to original dimensions
-        depth = F.interpolate(depth[None], (h, w),
-                              mode="bilinear",
-                              align_corners=False)[0, 0]
+        Args:
+            shape: (height, width) of incoming frames
+            iterations: Number of forward passes
+        """
+        frame = np.random.randint(0, 256, (shape[0], shape[1], 3),
+                                  dtype=np.uint8)
+        for _ in range(iterations):
+            self.estimate_depth(frame)
 
-        # Normalize depth map
-        depth = (depth - depth.min()) / (depth.max() - depth.min()) * 255.0
-        depth_map = depth.cpu().numpy().astype('uint8')
+    @torch.no_grad()
+    def estimate_depth(self, frame):
+        """
+        Estimate depth from input frame.
 
-        return depth_map
+        Args:
+            frame: BGR image (OpenCV format)
 
-    def get_depth_at_point(self, depth_map, x, y):
+        Returns:
+            numpy array: Depth map normalized to 0-255 range
         """
-        Get normalized depth value at specific point.
+        h, w = frame.shape[:2]
+        depth = self._infer(self._prepare(frame).unsqueeze(0))
+        return self._postprocess(depth, h, w)[0]
+
+    @torch.no_grad()
+    def estimate_depth_batch(self, frames):
+        """
+        Estimate depth for several frames of the same size in one pass.
+
+        Always runs the eager model so batches of varying size do not force
+        the single-frame graph to be rebuilt.
 
         Args:
-            depth_map: Generated depth map
-            x, y: Coordinates
+            frames: List of BGR images
 
         Returns:
-            float: Normalized depth value (0-1)
+            numpy array: Depth maps (N x h x w) normalized to 0-255 range
         """
-        return depth_map[y, x] / 255.0
+        h, w = frames[0].shape[:2]
+        batch = torch.stack([self._prepare(frame) for frame in frames])
+        return self._postprocess(self._infer(batch, use_graph=False), h, w)
@@ -0,0 +1,249 @@
+"""
+Asynchronous interaction engine turning per-frame hand observations into
+zone events.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import (
+    DEPTH_THRESHOLD_NEAR,
+    DEPTH_THRESHOLD_FAR,
+    INTERACTION_QUEUE_SIZE,
+    INTERACTION_DWELL_TIME
+)
+
+# Zone states
+IDLE = 'idle'          # No hand over the zone
+ENTERED = 'entered'    # Hand over the zone at the wrong depth
+DWELL = 'dwell'        # Hand over the zone at touch depth, waiting for dwell
+TOUCHED = 'touched'    # Touch registered
+
+
+class Observation:
+    """Hand centers and depths of one frame."""
+
+    __slots__ = ('frame_info', 'centers', 'depths')
+
+    def __init__(self, frame_info, centers, depths):
+        self.frame_info = frame_info
+        self.centers = centers
+        self.depths = depths
+
+
+class InteractionEvent:
+    """Zone event emitted to subscribers."""
+
+    __slots__ = ('kind', 'box_name', 'correct', 'frame_info', 'timestamp')
+
+    def __init__(self, kind, box_name, correct, frame_info):
+        """
+        Initialize the event.
+
+        Args:
+            kind: 'enter', 'exit', 'touch' or 'complete'
+            box_name: Zone name, None for 'complete'
+            correct: Whether the zone is the current target
+            frame_info: FrameInfo of the originating frame
+        """
+        # Emit time, used for emit-to-delivery latency per subscriber
+        self.kind = kind
+        self.box_name = box_name
+        self.correct = correct
+        self.frame_info = frame_info
+        self.timestamp = time.monotonic()
+
+
+class ZoneState:
+    __slots__ = ('state', 'dwell_start')
+
+    def __init__(self):
+        self.state = IDLE
+        self.dwell_start = None
+
+
+class InteractionEngine:
+    def __init__(self, interaction_system, telemetry=None,
+                 queue_size=INTERACTION_QUEUE_SIZE,
+                 dwell_time=INTERACTION_DWELL_TIME):
+        """
+        Initialize the interaction engine.
+
+        Args:
+            interaction_system: InteractionSystem holding the zones
+            telemetry: Optional Telemetry for latency and drop accounting
+            queue_size: Pending observations kept before dropping the oldest
+            dwell_time: Seconds a hand must stay at touch depth in a zone
+        """
+        self.interaction_system = interaction_system
+        self.telemetry = telemetry
+        self.dwell_time = dwell_time
+        self.zones = {}
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._subscribers = []
+        self._thread = None
+
+    def subscribe(self, name, callback, kinds=None):
+        """
+        Register a subscriber running on its own single-thread executor, so
+        a slow subscriber only delays its own events.
+
+        Args:
+            name: Subscriber name, used for the executor thread
+            callback: Function called with each InteractionEvent
+            kinds: Event kinds to deliver, None for all
+        """
+        executor = ThreadPoolExecutor(max_workers=1,
+                                      thread_name_prefix=f"interaction-{name}")
+        self._subscribers.append((name, callback, kinds, executor))
+
+    def start(self):
+        """Start the engine thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the engine thread and wait for pending events."""
+        if self._thread is not None:
+            self._put(None, record_drop=False)
+            # Executors can only be shut down once nothing emits events
+            self._thread.join()
+            self._thread = None
+        for _, _, _, executor in self._subscribers:
+            executor.shutdown(wait=True)
+
+    def submit(self, frame_info, hand_state):
+        """
+        Queue a frame's hand observations without blocking.
+
+        Args:
+            frame_info: FrameInfo of the frame
+            hand_state: HandState with depths sampled
+        """
+        self._put(Observation(frame_info, hand_state.centers,
+                              hand_state.depths))
+
+    def _put(self, item, record_drop=True):
+        """
+        Queue an item, dropping the oldest observation when full.
+
+        Args:
+            item: Observation, or None to stop the engine
+            record_drop: Count a dropped observation in telemetry
+        """
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    continue
+                if record_drop and self.telemetry is not None:
+                    self.telemetry.record_drop('interaction')
+
+    def _run(self):
+        """Consume observations until stopped."""
+        while True:
+            observation = self._queue.get()
+            if observation is None:
+                break
+            self.process(observation)
+
+    def process(self, observation):
+        """
+        Advance the zone state machines with one observation.
+
+        Args:
+            observation: Observation of a frame
+        """
+        info = observation.frame_info
+        system = self.interaction_system
+        events = []
+
+        with system.lock:
+            target_box = system.target_box
+            for name in list(self.zones):
+                if name not in system.box_coords:
+                    del self.zones[name]
+
+            for name, box in system.box_coords.items():
+                zone = self.zones.setdefault(name, ZoneState())
+                correct = name == target_box
+                if box["touched"]:
+                    zone.state = TOUCHED
+                    continue
+
+                in_zone, at_depth = self._check_zone(box["coords"],
+                                                     observation)
+                if not in_zone:
+                    if zone.state != IDLE:
+                        events.append(InteractionEvent('exit', name,
+                                                       correct, info))
+                    zone.state = IDLE
+                    continue
+
+                if zone.state == IDLE:
+                    events.append(InteractionEvent('enter', name,
+                                                   correct, info))
+                    zone.state = ENTERED
+                if not at_depth:
+                    zone.state = ENTERED
+                    continue
+                if zone.state == ENTERED:
+                    zone.state = DWELL
+                    zone.dwell_start = info.t_capture
+                if info.t_capture - zone.dwell_start >= self.dwell_time and \
+                        system.handle_box_interaction(name):
+                    zone.state = TOUCHED
+                    events.append(InteractionEvent('touch', name,
+                                                   correct, info))
+
+            if system.mark_completion_published():
+                events.append(InteractionEvent('complete', None, True, info))
+
+        info.mark('interaction')
+        if self.telemetry is not None:
+            self.telemetry.record_latency('stage.interaction',
+                                          info.t_interaction - info.t_hands)
+
+        for event in events:
+            self._emit(event)
+
+    def _check_zone(self, coords, observation):
+        """
+        Check hands against a zone.
+
+        Returns:
+            tuple: (any hand over the zone, any such hand at touch depth)
+        """
+        x1, y1, x2, y2 = coords
+        in_zone = at_depth = False
+        for (x, y), depth in zip(observation.centers, observation.depths):
+            if x1 < x < x2 and y1 < y < y2:
+                in_zone = True
+                if DEPTH_THRESHOLD_NEAR < depth < DEPTH_THRESHOLD_FAR:
+                    at_depth = True
+                    break
+        return in_zone, at_depth
+
+    def _emit(self, event):
+        """Hand an event to each interested subscriber's executor."""
+        for name, callback, kinds, executor in self._subscribers:
+            if kinds is None or event.kind in kinds:
+                executor.submit(self._deliver, name, callback, event)
+
+    def _deliver(self, name, callback, event):
+        """Run a subscriber callback, keeping its errors off other threads."""
+        if self.telemetry is not None:
+            # Time spent waiting behind earlier events on this subscriber
+            self.telemetry.record_latency(f'subscriber.{name}',
+                                          time.monotonic() - event.timestamp)
+        try:
+            callback(event)
+        except Exception as e:
+            print(f"Interaction subscriber {name} failed: {e}")
@@ -3,6 +3,7 @@ Interaction system managing boxes and user interaction.
 """
 
 import string
+import threading
 import pygame
 import cv2
 from PIL import Image, ImageDraw, ImageFont
@@ -24,6 +25,9 @@ class InteractionSystem:
         self.box_count = 0
         self.drawing = False
         self.start_pos = (-1, -1)
+        # Guards box_coords, target_box and completion_published, which are
+        # shared by the UI, MQTT and interaction engine threads
+        self.lock = threading.RLock()
 
         # Initialize sounds
         pygame.mixer.init()
@@ -70,55 +74,99 @@ class InteractionSystem:
 
     def finish_box_drawing(self, x, y):
         """Finish drawing a box."""
-        if self.drawing and self.box_count < MAX_BOXES:
-            self.drawing = False
-            box_name = self.generate_box_name()
-            self.box_coords[box_name] = {
-                "coords": self.start_pos + (x, y),
-                "touched": False
-            }
-            self.box_count += 1
-
-    def handle_box_interaction(self, box_name, correct=True):
-        """Handle interaction with a box."""
-        if not self.box_coords[box_name]["touched"]:
-            self.box_coords[box_name]["touched"] = True
-            if correct:
-                self.sounds['target'].play()
-            else:
-                self.sounds['non_target'].play()
+        with self.lock:
+            if self.drawing and self.box_count < MAX_BOXES:
+                self.drawing = False
+                box_name = self.generate_box_name()
+                self.box_coords[box_name] = {
+                    "coords": self.start_pos + (x, y),
+                    "touched": False
+                }
+                self.box_count += 1
+
+    def handle_box_interaction(self, box_name):
+        """
+        Mark a box as touched.
+
+        Returns:
+            bool: True if the box was newly touched
+        """
+        with self.lock:
+            box = self.box_coords.get(box_name)
+            if box is not None and not box["touched"]:
+                box["touched"] = True
+                return True
+            return False
+
+    def play_touch_sound(self, correct=True):
+        """Play the feedback sound for a touch."""
+        if correct:
+            self.sounds['target'].play()
+        else:
+            self.sounds['non_target'].play()
 
     def is_interaction_complete(self):
         """Check if all boxes have been interacted with."""
-        return all(box["touched"] for box in self.box_coords.values())
+        with self.lock:
+            return all(box["touched"] for box in self.box_coords.values())
+
+    def mark_completion_published(self):
+        """
+        Mark completion as published if all boxes are touched.
+
+        Returns:
+            bool: True if completion should be published now
+        """
+        with self.lock:
+            if (self.box_coords and not self.completion_published and
+                    self.is_interaction_complete()):
+                self.completion_published = True
+                return True
+            return False
 
     def reset(self):
         """Reset the interaction system."""
-        self.box_coords.clear()
-        self.target_box = None
-        self.completion_published = False
-        self.box_count = 0
-        self.drawing = False
-        self.start_pos = (-1, -1)
+        with self.lock:
+            self.box_coords.clear()
+            self.target_box = None
+            self.completion_published = False
+            self.box_count = 0
+            self.drawing = False
+            self.start_pos = (-1, -1)
+
+    def snapshot(self):
+        """
+        Get a consistent copy of the boxes for drawing.
+
+        Returns:
+            tuple: (box_coords copy, target_box)
+        """
+        with self.lock:
+            return ({name: dict(box) for name, box in self.box_coords.items()},
+                    self.target_box)
 
     def get_box_at_position(self, x, y):
         """Get box name at given position."""
-        for name, box in self.box_coords.items():
-            x1, y1, x2, y2 = box["coords"]
-            if x1 < x < x2 and y1 < y < y2:
-                return name
-        return None
+        with self.lock:
+            for name, box in self.box_coords.items():
+                x1, y1, x2, y2 = box["coords"]
+                if x1 < x < x2 and y1 < y < y2:
+                    return name
+            return None
 
     def set_target_box(self, box_name):
         """Set the target box."""
-        if box_name in self.box_coords:
-            self.target_box = box_name
-            return True
-        return False
+        with self.lock:
+            if box_name in self.box_coords:
+                self.target_box = box_name
+                return True
+            return False
 
     def get_progress(self):
         """Get interaction progress percentage."""
-        if not self.box_coords:
-            return 0
-        touched = sum(1 for box in self.box_coords.values() if box["touched"])
-        return (touched / len(self.box_coords)) * 100
+        with self.lock:
+            if not self.box_coords:
+                return 0
+            touched = sum(1 for box in self.box_coords.values()
+                          if box["touched"])
+            return (touched / len(self.box_coords)) * 100
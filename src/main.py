@@ -2,15 +2,25 @@
 Main entry point for the HandTrack3D system.
 """
 
+import time
+
 import cv2
 import pygame
 from PIL import ImageFont
 
-from config import CAMERA_INDEX, FONT_PATHS, FONT_SIZES
+from config import (
+    FONT_PATHS,
+    FONT_SIZES,
+    STATS_DUMP_PATH,
+    STATS_DUMP_INTERVAL
+)
+from capture import create_frame_source
 from hand_tracker import HandTracker
 from depth_estimator import DepthEstimator
 from interaction_system import InteractionSystem
+from interaction_engine import InteractionEngine
 from utils.mqtt_handler import MQTTHandler
+from utils.telemetry import FrameInfo, Telemetry
 from utils.visualization import Visualizer
 
 
@@ -37,9 +47,19 @@ class HandTrack3D:
         self.interaction_system = InteractionSystem()
         self.mqtt_handler = MQTTHandler(self.interaction_system)
         self.visualizer = Visualizer(self.fonts)
+        self.telemetry = Telemetry()
+        self.interaction_engine = InteractionEngine(self.interaction_system,
+                                                    self.telemetry)
+        self.interaction_engine.subscribe('sound', self.on_touch, ('touch',))
+        self.interaction_engine.subscribe('mqtt', self.on_complete,
+                                          ('complete',))
+        self.interaction_engine.subscribe('ui', self.on_status,
+                                          ('touch', 'complete'))
+        self.status_message = ""
 
         # Initialize camera
         self.camera = None
+        self.last_frame = None
 
         # Initialize pygame for audio
         pygame.init()
@@ -47,8 +67,8 @@ class HandTrack3D:
 
     def setup_camera(self):
         """Setup and initialize the camera."""
-        self.camera = cv2.VideoCapture(CAMERA_INDEX)
-        if not self.camera.isOpened():
+        self.camera = create_frame_source()
+        if not self.camera.start():
             raise RuntimeError("Failed to open camera")
 
         cv2.namedWindow('HandTrack3D', cv2.WINDOW_NORMAL)
@@ -60,101 +80,117 @@ class HandTrack3D:
             self.interaction_system.start_box_drawing(x, y)
         elif event == cv2.EVENT_MOUSEMOVE:
             coords = self.interaction_system.update_box_drawing(x, y)
-            if coords:
-                ret, frame = self.camera.read()
-                if ret:
-                    cv2.rectangle(frame, (coords[0], coords[1]),
-                                  (coords[2], coords[3]), (0, 255, 0), 2)
-                    cv2.imshow('HandTrack3D', frame)
+            if coords and self.last_frame is not None:
+                # Preview on the last displayed frame rather than taking
+                # frames away from the pipeline
+                frame = self.last_frame.copy()
+                cv2.rectangle(frame, (coords[0], coords[1]),
+                              (coords[2], coords[3]), (0, 255, 0), 2)
+                cv2.imshow('HandTrack3D', frame)
         elif event == cv2.EVENT_LBUTTONUP:
             self.interaction_system.finish_box_drawing(x, y)
 
-    def process_frame(self, frame):
-        """Process a single frame."""
+    def process_frame(self, frame, frame_info):
+        """
+        Process a single frame.
+
+        Args:
+            frame: BGR image
+            frame_info: FrameInfo of the frame, stamped as stages complete
+        """
         # Get depth map
         depth_map = self.depth_estimator.estimate_depth(frame)
+        frame_info.mark('depth')
 
         # Detect hands
-        hand_results = self.hand_tracker.detect_hands(frame)
-        hand_detected = bool(hand_results.multi_hand_landmarks)
+        hand_state = self.hand_tracker.detect_hands(frame)
+        hand_state.sample_depths(depth_map)
+        self.telemetry.record_hands(hand_state)
+        hand_detected = len(hand_state) > 0
+        frame_info.mark('hands')
+
+        # Interaction decisions happen on the engine thread
+        self.interaction_engine.submit(frame_info, hand_state)
 
         # Draw visualizations
         self.visualizer.draw_fps(frame)
         self.visualizer.draw_hand_detection_indicator(frame, hand_detected)
         self.visualizer.draw_depth_visualization(frame, depth_map)
 
-        if self.interaction_system.box_coords:
-            # Draw boxes and process hand interactions
-            self.visualizer.draw_boxes(frame,
-                                       self.interaction_system.box_coords,
-                                       self.interaction_system.target_box)
-
-            status_message = ""
+        box_coords, target_box = self.interaction_system.snapshot()
+        if box_coords:
+            self.visualizer.draw_boxes(frame, box_coords, target_box)
             if hand_detected:
-                for hand_landmarks in hand_results.multi_hand_landmarks:
-                    self.hand_tracker.draw_landmarks(frame, hand_results)
-
-                    for box_name, box_info in self.interaction_system.box_coords.items():
-                        if not box_info["touched"]:
-                            hand_center = self.hand_tracker.get_hand_center(
-                                hand_landmarks,
-                                frame.shape
-                            )
-                            depth_value = self.depth_estimator.get_depth_at_point(
-                                depth_map,
-                                hand_center[0],
-                                hand_center[1]
-                            )
-
-                            if self.hand_tracker.check_hand_in_box(
-                                hand_landmarks,
-                                box_info["coords"],
-                                depth_value,
-                                frame.shape
-                            ):
-                                is_target = box_name == self.interaction_system.target_box
-                                self.interaction_system.handle_box_interaction(
-                                    box_name,
-                                    correct=is_target
-                                )
-                                status_message = (
-                                    f"{box_name} touched "
-                                    f"{'correctly!' if is_target else 'incorrectly.'}"
-                                )
-
-            # Check completion
-            if (self.interaction_system.is_interaction_complete() and
-                    not self.interaction_system.completion_published):
-                self.mqtt_handler.publish_completion()
-                self.interaction_system.completion_published = True
-                status_message = "All boxes touched! Task completed!"
+                self.hand_tracker.draw_landmarks(frame, hand_state)
 
             # Update progress and status
             progress = self.interaction_system.get_progress()
             self.visualizer.draw_progress_bar(frame, progress)
-            self.visualizer.draw_status_message(frame, status_message)
+            self.visualizer.draw_status_message(frame, self.status_message)
         else:
             self.visualizer.draw_instructions(frame)
 
         return frame
 
+    def on_touch(self, event):
+        """Play touch feedback and record its latency."""
+        self.interaction_system.play_touch_sound(event.correct)
+        self.telemetry.record_event('touch', event.frame_info)
+
+    def on_complete(self, event):
+        """Publish completion and record its latency."""
+        self.mqtt_handler.publish_completion()
+        self.telemetry.record_event('completion', event.frame_info)
+
+    def on_status(self, event):
+        """Update the status message shown on screen."""
+        if event.kind == 'complete':
+            self.status_message = "All boxes touched! Task completed!"
+        else:
+            self.status_message = (
+                f"{event.box_name} touched "
+                f"{'correctly!' if event.correct else 'incorrectly.'}"
+            )
+
     def run(self):
         """Main run loop."""
         try:
             self.setup_camera()
             self.mqtt_handler.connect()
+            self.interaction_engine.start()
+            last_seq = 0
+            next_dump = time.monotonic() + STATS_DUMP_INTERVAL
 
             while True:
                 ret, frame = self.camera.read()
                 if not ret:
+                    if self.camera.isOpened():
+                        # No new frame yet, keep the window responsive
+                        if cv2.waitKey(1) & 0xFF == ord('q'):
+                            break
+                        continue
                     print("Failed to grab frame")
                     break
 
-                frame = cv2.flip(frame, 1)  # Mirror image
-                processed_frame = self.process_frame(frame)
+                # Frames captured but never processed were dropped
+                self.telemetry.record_drop('capture',
+                                           self.camera.last_seq - last_seq - 1)
+                last_seq = self.camera.last_seq
+                frame_info = FrameInfo(last_seq, self.camera.last_timestamp)
+
+                processed_frame = self.process_frame(frame, frame_info)
                 cv2.imshow('HandTrack3D', processed_frame)
+                self.last_frame = processed_frame
 
+                # The window is only painted inside waitKey
                 key = cv2.waitKey(1) & 0xFF
+                frame_info.mark('display')
+                self.telemetry.record_frame(frame_info)
+
+                if time.monotonic() >= next_dump:
+                    self.telemetry.dump(STATS_DUMP_PATH)
+                    next_dump = time.monotonic() + STATS_DUMP_INTERVAL
+
                 if key == ord('q'):
                     break
                 elif key == ord('f'):
@@ -162,6 +198,9 @@ class HandTrack3D:
                     cv2.setWindowProperty('HandTrack3D',
                                           cv2.WND_PROP_FULLSCREEN,
                                           cv2.WINDOW_FULLSCREEN)
+                elif key == ord('s'):
+                    self.telemetry.dump(STATS_DUMP_PATH)
+                    print(f"Stats written to {STATS_DUMP_PATH}")
 
         except Exception as e:
             print(f"Error occurred: {e}")
@@ -172,6 +211,8 @@ class HandTrack3D:
         """Cleanup resources."""
         if self.camera is not None:
             self.camera.release()
+        self.interaction_engine.stop()
+        self.telemetry.dump(STATS_DUMP_PATH)
         self.mqtt_handler.disconnect()
         self.hand_tracker.release()
         cv2.destroyAllWindows()
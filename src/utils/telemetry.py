@@ -0,0 +1,186 @@
+"""
+Frame lineage and latency telemetry for the HandTrack3D system.
+"""
+
+import json
+import threading
+import time
+from collections import defaultdict, deque
+
+import numpy as np
+from config import STATS_WINDOW_SIZE
+
+# Pipeline stages in the order a frame passes through them
+FRAME_STAGES = ('capture', 'depth', 'hands', 'interaction', 'display')
+# Stages decided off the render path, recorded by their own thread
+ASYNC_STAGES = ('interaction',)
+
+
+class FrameInfo:
+    """Sequence number and monotonic stage timestamps of one frame."""
+
+    __slots__ = ('seq',) + tuple(f't_{stage}' for stage in FRAME_STAGES)
+
+    def __init__(self, seq, t_capture):
+        """
+        Initialize frame lineage.
+
+        Args:
+            seq: Capture sequence number
+            t_capture: time.monotonic() at capture
+        """
+        self.seq = seq
+        self.t_capture = t_capture
+        self.t_depth = None
+        self.t_hands = None
+        self.t_interaction = None
+        self.t_display = None
+
+    def mark(self, stage):
+        """Record the current time for a stage."""
+        setattr(self, f't_{stage}', time.monotonic())
+
+    def age(self):
+        """Seconds elapsed since capture."""
+        return time.monotonic() - self.t_capture
+
+
+class Telemetry:
+    def __init__(self, window_size=STATS_WINDOW_SIZE):
+        """
+        Initialize telemetry.
+
+        Args:
+            window_size: Number of samples kept per distribution
+        """
+        self.window_size = window_size
+        self._lock = threading.Lock()
+        self._latencies = defaultdict(lambda: deque(maxlen=self.window_size))
+        self._drops = defaultdict(int)
+        self._handedness = defaultdict(int)
+        self._hand_scores = deque(maxlen=self.window_size)
+        self._hand_depths = deque(maxlen=self.window_size)
+        self.frames = 0
+        self.frames_with_hands = 0
+        self.start_time = time.monotonic()
+
+    def _add(self, name, seconds):
+        """Append a latency sample in milliseconds."""
+        self._latencies[name].append(seconds * 1000.0)
+
+    def record_frame(self, info):
+        """
+        Record render path stage and end-to-end latencies of a displayed
+        frame.
+
+        Args:
+            info: FrameInfo with render path stage timestamps set
+        """
+        with self._lock:
+            self.frames += 1
+            previous = info.t_capture
+            for stage in FRAME_STAGES[1:]:
+                if stage in ASYNC_STAGES:
+                    continue
+                t = getattr(info, f't_{stage}')
+                if t is None:
+                    continue
+                self._add(f'stage.{stage}', t - previous)
+                previous = t
+            if info.t_display is not None:
+                self._add('frame.end_to_end', info.t_display - info.t_capture)
+
+    def record_hands(self, hand_state):
+        """
+        Record detection statistics of a frame.
+
+        Args:
+            hand_state: HandState with depths sampled
+        """
+        if not len(hand_state):
+            return
+        with self._lock:
+            self.frames_with_hands += 1
+            for label in hand_state.handedness:
+                self._handedness[label] += 1
+            self._hand_scores.extend(hand_state.scores.tolist())
+            self._hand_depths.extend(hand_state.depths.tolist())
+
+    def record_latency(self, name, seconds):
+        """Record a latency sample under an arbitrary name."""
+        with self._lock:
+            self._add(name, seconds)
+
+    def record_event(self, name, info):
+        """
+        Record latency from a frame's capture until an event happened.
+
+        Args:
+            name: Event name, e.g. 'touch' or 'completion'
+            info: FrameInfo of the originating frame
+        """
+        with self._lock:
+            self._add(f'event.{name}', info.age())
+
+    def record_drop(self, stage, count=1):
+        """Count frames dropped or skipped at a stage."""
+        if count > 0:
+            with self._lock:
+                self._drops[stage] += count
+
+    def snapshot(self):
+        """
+        Summarize the collected statistics.
+
+        Returns:
+            dict: Frame count, drops per stage, latency percentiles (ms)
+                and hand detection statistics
+        """
+        with self._lock:
+            latencies = {name: np.array(samples)
+                         for name, samples in self._latencies.items()}
+            drops = dict(self._drops)
+            frames = self.frames
+            hands = {
+                'frames_with_hands': self.frames_with_hands,
+                'handedness': dict(self._handedness),
+                'score': self._summarize(np.array(self._hand_scores)),
+                'depth': self._summarize(np.array(self._hand_depths))
+            }
+
+        elapsed = time.monotonic() - self.start_time
+        summary = {}
+        for name, samples in sorted(latencies.items()):
+            if len(samples):
+                summary[name] = self._summarize(samples)
+
+        return {
+            'frames': frames,
+            'fps': frames / elapsed if elapsed > 0 else 0.0,
+            'dropped': drops,
+            'latency_ms': summary,
+            'hands': hands
+        }
+
+    @staticmethod
+    def _summarize(samples):
+        """Summarize a sample array, None when empty."""
+        if not len(samples):
+            return None
+        p50, p90, p99 = np.percentile(samples, (50, 90, 99))
+        return {
+            'count': len(samples),
+            'mean': float(samples.mean()),
+            'p50': float(p50),
+            'p90': float(p90),
+            'p99': float(p99),
+            'max': float(samples.max())
+        }
+
+    def dump(self, path):
+        """Write a stats snapshot to a JSON file."""
+        try:
+            with open(path, 'w') as f:
+                json.dump(self.snapshot(), f, indent=2)
+        except OSError as e:
+            print(f"Failed to write stats to {path}: {e}")